@@ -1,10 +1,12 @@
 import logging
 import os
+import queue
+import random
 import sys
 import time
 from contextlib import suppress
-from functools import wraps
 from http import HTTPStatus
+from logging.handlers import QueueHandler, QueueListener
 
 import requests
 from dotenv import load_dotenv
@@ -13,18 +15,28 @@ from telebot import apihelper, TeleBot
 from exceptions import StatusError
 
 
-load_dotenv(".env", override=True)
+load_dotenv(".env")
 
 
 PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
-RETRY_PERIOD = 600
+RETRY_PERIOD = int(os.getenv('RETRY_PERIOD', 600))
+# Максимальная пауза между запросами при повторяющихся сбоях
+MAX_RETRY_PERIOD = 3600
+# Интервал, в течение которого одинаковая ошибка не отправляется повторно
+ERROR_MESSAGE_TTL = 3600
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+# Таймауты запроса к API: (подключение, чтение) в секундах
+REQUEST_TIMEOUT = (5, 30)
 
 MAX_LOG_SIZE = 50000000
+# Максимальная длина сообщения в Telegram
+MAX_MESSAGE_LENGTH = 4096
+# Количество попыток отправки сообщения при ограничении частоты запросов
+SEND_ATTEMPTS = 3
 
 HOMEWORK_VERDICTS = {
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
@@ -32,56 +44,76 @@ HOMEWORK_VERDICTS = {
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
 
-# Токены необходимые для работы программы
-TOKENS = ('PRACTICUM_TOKEN', 'TELEGRAM_CHAT_ID', 'TELEGRAM_TOKEN')
-
 # Настройка логирования
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler(sys.stdout)
+logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+handler = logging.StreamHandler(sys.stderr)
 formatter = logging.Formatter(
     '%(asctime)s [%(levelname)s] %(message)s %(name)s'
 )
-handler.setFormatter(formatter)
-logger.addHandler(handler)
-
-
-def check_message(func):
-    """Проверяет, что сообщение не совпадает с предыдущим."""
-    previous_message = ''
-
-    @wraps(func)
-    def wrapper(bot, message):
-        nonlocal previous_message
-
-        if message != previous_message:
-            func(bot, message)
-            previous_message = message
-        else:
-            logger.debug('Получено повторяющееся сообщение.')
-
-    return wrapper
+# Запись в поток выполняется в отдельном потоке через очередь.
+# QueueHandler форматирует запись сам, вместе с трассировкой,
+# поэтому обработчику потока остается только вывести сообщение.
+log_queue = queue.Queue(-1)
+queue_handler = QueueHandler(log_queue)
+queue_handler.setFormatter(formatter)
+handler.setFormatter(logging.Formatter('%(message)s'))
+listener = QueueListener(log_queue, handler)
 
 
 def check_tokens():
     """Проверяет доступность переменных окружения."""
-    missing_tokens = [token for token in TOKENS if not globals()[token]]
+    tokens = (
+        ('PRACTICUM_TOKEN', PRACTICUM_TOKEN),
+        ('TELEGRAM_CHAT_ID', TELEGRAM_CHAT_ID),
+        ('TELEGRAM_TOKEN', TELEGRAM_TOKEN),
+    )
+    missing_tokens = [name for name, value in tokens if not value]
 
     if missing_tokens:
         error = (
-            'Отсутствуют переменные окружения:',
+            'Отсутствуют переменные окружения: '
             f'{", ".join(missing_tokens)}'
         )
         logger.critical(error)
-        raise ValueError(error)
+        raise SystemExit(error)
+
+
+def check_retry_period():
+    """Проверяет, что интервал опроса API не меньше секунды."""
+    if RETRY_PERIOD < 1:
+        error = (
+            'Интервал опроса RETRY_PERIOD должен быть не меньше 1 секунды, '
+            f'получено: {RETRY_PERIOD}.'
+        )
+        logger.critical(error)
+        raise SystemExit(error)
 
 
-@check_message
 def send_message(bot, message):
     """Отправляет сообщения в Telegram-чат."""
     logger.debug('Сообщение отправляется.')
 
-    bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
+    for attempt in range(1, SEND_ATTEMPTS + 1):
+        try:
+            bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
+            break
+
+        except apihelper.ApiTelegramException as error:
+            if (
+                error.error_code != HTTPStatus.TOO_MANY_REQUESTS
+                or attempt == SEND_ATTEMPTS
+            ):
+                raise
+
+            retry_after = error.result_json.get(
+                'parameters', {}
+            ).get('retry_after', 1)
+            logger.warning(
+                'Превышен лимит запросов к Telegram, повтор через %s с.',
+                retry_after
+            )
+            time.sleep(retry_after + random.uniform(0, 1))
 
     logger.debug('Сообщение успешно отправлено.')
 
@@ -90,17 +122,23 @@ def get_api_answer(timestamp):
     """Делает запрос к эндпоинту API-сервиса."""
     payload = {'from_date': timestamp}
 
-    logger.debug(f'Запрос к {ENDPOINT} с параметрами {payload}')
+    logger.debug('Запрос к %s с параметрами %s', ENDPOINT, payload)
 
     try:
         response = requests.get(
             ENDPOINT,
             headers=HEADERS,
-            params=payload
+            params=payload,
+            timeout=REQUEST_TIMEOUT
         )
 
     except requests.RequestException as error:
-        raise ConnectionError(f'Произошла ошибка: {error}.')
+        # Текст исключения requests меняется от попытки к попытке,
+        # поэтому в сообщение попадает только его тип, а подробности
+        # остаются в трассировке
+        raise ConnectionError(
+            f'Не удалось выполнить запрос к API: {type(error).__name__}.'
+        ) from error
 
     if response.status_code != HTTPStatus.OK:
         raise StatusError(
@@ -148,16 +186,15 @@ def parse_status(homework):
     """Извлекает информацию о конкретной домашней работе."""
     logger.debug('Начинало парсинга.')
 
-    homework_name = homework.get('homework_name')
-    status = homework.get('status')
-    verdict = HOMEWORK_VERDICTS.get(status)
-
-    missing_keys = [key for key in ('homework_name', 'status')
-                    if key not in homework]
-    if missing_keys:
-        raise KeyError(f'Отсутствуют ключи: {", ".join(missing_keys)}.')
+    try:
+        homework_name = homework['homework_name']
+        status = homework['status']
+    except KeyError as error:
+        raise KeyError(f'Отсутствует ключ: {error}.')
 
-    if verdict is None:
+    try:
+        verdict = HOMEWORK_VERDICTS[status]
+    except KeyError:
         raise ValueError(
             f'Статус отсутствует в HOMEWORKS_VERDICTS. Статус: {status}.'
         )
@@ -167,42 +204,148 @@ def parse_status(homework):
     return f'Изменился статус проверки работы "{homework_name}". {verdict}'
 
 
+def join_messages(messages):
+    """Объединяет сообщения в блоки не длиннее MAX_MESSAGE_LENGTH."""
+    blocks = []
+    block = ''
+
+    for message in messages:
+        # Слишком длинное сообщение делится на части
+        parts = [
+            message[start:start + MAX_MESSAGE_LENGTH]
+            for start in range(0, len(message), MAX_MESSAGE_LENGTH)
+        ]
+
+        for part in parts:
+            candidate = f'{block}\n\n{part}' if block else part
+
+            if block and len(candidate) > MAX_MESSAGE_LENGTH:
+                blocks.append(block)
+                block = part
+            else:
+                block = candidate
+
+    if block:
+        blocks.append(block)
+
+    return blocks
+
+
+def collect_status_changes(homeworks, last_statuses):
+    """Собирает сообщения о домашних работах с изменившимся статусом."""
+    messages = []
+    new_statuses = {}
+    errors = []
+
+    for homework in homeworks:
+        # Ошибка в одной работе не мешает сообщить об остальных
+        try:
+            homework_name = homework['homework_name']
+            status = homework['status']
+        except KeyError as error:
+            error_message = f'Сбой в работе программы: нет ключа {error}.'
+            logger.error(error_message)
+            errors.append(error_message)
+
+            continue
+
+        # Для неизменившегося статуса сообщение не собирается
+        if last_statuses.get(homework_name) == status:
+            continue
+
+        try:
+            message = parse_status(homework)
+        except ValueError as error:
+            error_message = f'Сбой в работе программы: {error}'
+            logger.error(error_message)
+            errors.append(error_message)
+
+            continue
+
+        messages.append(message)
+        new_statuses[homework_name] = status
+
+    return messages, new_statuses, errors
+
+
+def send_error_message(bot, message, errors_sent_at):
+    """Отправляет сообщение об ошибке не чаще раза в ERROR_MESSAGE_TTL."""
+    now = time.time()
+
+    for sent_message, sent_at in list(errors_sent_at.items()):
+        if now - sent_at >= ERROR_MESSAGE_TTL:
+            del errors_sent_at[sent_message]
+
+    if message in errors_sent_at:
+        logger.debug('Сообщение об ошибке уже отправлялось.')
+
+        return
+
+    with suppress(Exception):
+        send_message(bot, message)
+        errors_sent_at[message] = now
+
+
 def main():
     """Основная логика работы бота."""
     check_tokens()
+    check_retry_period()
 
     # Создаем объект класса бота
     bot = TeleBot(token=TELEGRAM_TOKEN)
     timestamp = int(time.time())
+    retry_period = RETRY_PERIOD
+    # Пауза, которая будет выдержана после следующего сбоя
+    backoff = RETRY_PERIOD
+    # Последний отправленный статус по каждой домашней работе
+    last_statuses = {}
+    # Время последней отправки каждого сообщения об ошибке
+    errors_sent_at = {}
 
     while True:
         try:
             response = get_api_answer(timestamp)
             homeworks = check_response(response)
 
-            if not homeworks:
-                logger.debug('Нет изменений.')
+            # Ответ получен: возвращаемся к обычному интервалу опроса
+            retry_period = backoff = RETRY_PERIOD
 
-                continue
+            messages, new_statuses, errors = collect_status_changes(
+                homeworks, last_statuses
+            )
+
+            for error_message in errors:
+                send_error_message(bot, error_message, errors_sent_at)
 
-            message = parse_status(homeworks[0])
-            send_message(bot, message)
+            if not new_statuses:
+                logger.debug('Нет изменений.')
+            else:
+                for message in join_messages(messages):
+                    send_message(bot, message)
+
+                last_statuses.update(new_statuses)
 
             timestamp = response.get('current_date', timestamp)
 
-        except apihelper.ApiException or requests.exceptions.RequestException:
+        except (apihelper.ApiException, requests.exceptions.RequestException):
             logger.exception('Сбой в телеграм.')
 
         except Exception as error:
             message = f'Сбой в работе программы: {error}'
             logger.exception(message)
+            send_error_message(bot, message, errors_sent_at)
 
-            with suppress(Exception):
-                send_message(bot, message)
+            # При повторных сбоях удваиваем паузу, но не больше максимума
+            retry_period = backoff
+            backoff = max(RETRY_PERIOD, min(backoff * 2, MAX_RETRY_PERIOD))
 
-        finally:
-            time.sleep(RETRY_PERIOD)
+        time.sleep(retry_period)
 
 
 if __name__ == '__main__':
-    main()
+    logger.addHandler(queue_handler)
+    listener.start()
+    try:
+        main()
+    finally:
+        listener.stop()
@@ -116,6 +116,22 @@ class MockTelegramBot:
         self.text = text
 
 
+class RecordingTelegramBot:
+    """Telegram bot mock that keeps sent texts.
+
+    Exceptions from `errors` are raised, in order, by the first sends.
+    """
+
+    def __init__(self, *args, errors=(), **kwargs):
+        self.errors = list(errors)
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.append(text)
+
+
 class BreakInfiniteLoop(BaseException):
     pass
 
@@ -36,6 +36,63 @@ def get_mock_telegram_bot(monkeypatch, random_message):
     return telebot.TeleBot(token='')
 
 
+def telegram_exception(error_code, retry_after=None):
+    result_json = {'error_code': error_code, 'description': 'error'}
+    if retry_after is not None:
+        result_json['parameters'] = {'retry_after': retry_after}
+    return telebot.apihelper.ApiTelegramException(
+        'send_message', None, result_json
+    )
+
+
+def create_mock_get_with_failures(failures, random_timestamp):
+    calls = []
+
+    def mock_get(*args, **kwargs):
+        calls.append(kwargs)
+        if len(calls) <= failures:
+            raise requests.RequestException('Something wrong')
+        return check_utils.MockResponseGET(random_timestamp=random_timestamp)
+
+    return mock_get
+
+
+def create_mock_get_with_errors(errors):
+    errors = list(errors)
+
+    def mock_get(*args, **kwargs):
+        raise requests.ConnectionError(errors.pop(0))
+
+    return mock_get
+
+
+def run_main(
+        monkeypatch, homework_module, mock_get, bot, iterations, clock=None
+):
+    """Run `main()` for `iterations` loop passes and return the pauses.
+
+    If `clock` (a one-item list) is given, `time.time()` returns its value
+    and every pause moves it forward.
+    """
+    sleeps = []
+
+    def mock_sleep(secs):
+        sleeps.append(secs)
+        if clock is not None:
+            clock[0] += secs
+        if len(sleeps) == iterations:
+            raise check_utils.BreakInfiniteLoop('break')
+
+    monkeypatch.setattr(time, 'sleep', mock_sleep)
+    if clock is not None:
+        monkeypatch.setattr(time, 'time', lambda: clock[0])
+    monkeypatch.setattr(requests, 'get', mock_get)
+    monkeypatch.setattr(homework_module, 'TeleBot', lambda *a, **kw: bot)
+    with pytest.raises(check_utils.BreakInfiniteLoop):
+        homework_module.main()
+    return sleeps
+
+
 class TestHomework:
     HOMEWORK_VERDICTS = {
         'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
@@ -825,3 +882,323 @@ class TestHomework:
     def test_docstrings(self, homework_module):
         for func in self.HOMEWORK_FUNC_WITH_PARAMS_QTY:
             check_utils.check_docstring(homework_module, func)
+
+    def test_main_reports_homework_without_status(
+            self, monkeypatch, random_timestamp, homework_module
+    ):
+        mock_get = create_mock_response_get_with_custom_status_and_data(
+            random_timestamp=random_timestamp,
+            http_status=HTTPStatus.OK,
+            data={
+                'homeworks': [{'homework_name': 'hw_without_status'}],
+                'current_date': random_timestamp
+            }
+        )
+        bot = check_utils.RecordingTelegramBot()
+
+        run_main(monkeypatch, homework_module, mock_get, bot, iterations=1)
+
+        assert len(bot.sent) == 1 and 'status' in bot.sent[0], (
+            'Убедитесь, что о домашней работе без статуса сообщается в '
+            'Telegram.'
+        )
+
+    def test_main_resends_after_failed_send(
+            self, monkeypatch, random_timestamp, homework_module,
+            data_with_new_hw_status
+    ):
+        mock_get = create_mock_response_get_with_custom_status_and_data(
+            random_timestamp=random_timestamp,
+            http_status=HTTPStatus.OK,
+            data=data_with_new_hw_status
+        )
+        bot = check_utils.RecordingTelegramBot(errors=[
+            telebot.apihelper.ApiException(
+                'Произошла ошибка при отправке сообщения в Telegram.',
+                'send_message',
+                500
+            )
+        ])
+
+        run_main(monkeypatch, homework_module, mock_get, bot, iterations=3)
+
+        assert len(bot.sent) == 1, (
+            'Убедитесь, что после неудачной отправки сообщение отправляется '
+            'повторно при следующем запросе.'
+        )
+
+    def test_join_messages_splits_at_limit(self, homework_module):
+        limit = homework_module.MAX_MESSAGE_LENGTH
+        messages = ['a' * 3000, 'b' * 1000, 'c' * 200]
+
+        blocks = homework_module.join_messages(messages)
+
+        assert blocks == [
+            'a' * 3000 + '\n\n' + 'b' * 1000, 'c' * 200
+        ], (
+            'Убедитесь, что сообщения объединяются в блоки не длиннее '
+            f'{limit} символов.'
+        )
+
+    def test_join_messages_splits_long_message(self, homework_module):
+        limit = homework_module.MAX_MESSAGE_LENGTH
+        message = 'x' * (limit + 10)
+
+        blocks = homework_module.join_messages([message])
+
+        assert blocks == ['x' * limit, 'x' * 10], (
+            'Убедитесь, что сообщение длиннее лимита Telegram делится на '
+            'части.'
+        )
+
+    def test_join_messages_empty(self, homework_module):
+        assert homework_module.join_messages([]) == [], (
+            'Убедитесь, что для пустого списка сообщений не создаются блоки.'
+        )
+
+    def test_main_sends_valid_homeworks_despite_invalid_one(
+            self, monkeypatch, random_timestamp, homework_module
+    ):
+        mock_get = create_mock_response_get_with_custom_status_and_data(
+            random_timestamp=random_timestamp,
+            http_status=HTTPStatus.OK,
+            data={
+                'homeworks': [
+                    {'homework_name': 'hw_unknown', 'status': 'unknown'},
+                    {'homework_name': 'hw_approved', 'status': 'approved'}
+                ],
+                'current_date': random_timestamp
+            }
+        )
+        bot = check_utils.RecordingTelegramBot()
+
+        run_main(monkeypatch, homework_module, mock_get, bot, iterations=2)
+
+        status_messages = [
+            text for text in bot.sent
+            if self.HOMEWORK_VERDICTS['approved'] in text
+        ]
+        error_messages = [text for text in bot.sent if 'unknown' in text]
+        assert len(status_messages) == 1, (
+            'Убедитесь, что ошибка в одной домашней работе не мешает '
+            'сообщить об изменении статуса остальных.'
+        )
+        assert len(error_messages) == 1, (
+            'Убедитесь, что о домашней работе с неизвестным статусом '
+            'сообщается в Telegram.'
+        )
+
+    def test_send_message_retries_after_flood_control(
+            self, monkeypatch, random_message, homework_module
+    ):
+        sleeps = []
+        monkeypatch.setattr(time, 'sleep', sleeps.append)
+        bot = check_utils.RecordingTelegramBot(
+            errors=[telegram_exception(429, retry_after=2)]
+        )
+
+        homework_module.send_message(bot, f'{random_message}_retry')
+
+        assert bot.sent == [f'{random_message}_retry'], (
+            'Убедитесь, что после ошибки 429 сообщение отправляется повторно.'
+        )
+        assert len(sleeps) == 1 and 2 <= sleeps[0] <= 3, (
+            'Убедитесь, что перед повторной отправкой выдерживается пауза '
+            '`retry_after`.'
+        )
+
+    def test_send_message_gives_up_after_attempts(
+            self, monkeypatch, random_message, homework_module
+    ):
+        sleeps = []
+        monkeypatch.setattr(time, 'sleep', sleeps.append)
+        attempts = homework_module.SEND_ATTEMPTS
+        bot = check_utils.RecordingTelegramBot(
+            errors=[telegram_exception(429, retry_after=1)] * attempts
+        )
+
+        with pytest.raises(telebot.apihelper.ApiTelegramException):
+            homework_module.send_message(bot, f'{random_message}_flood')
+
+        assert not bot.sent and len(sleeps) == attempts - 1, (
+            'Убедитесь, что после последней попытки ошибка 429 '
+            'пробрасывается дальше.'
+        )
+
+    def test_send_message_raises_other_errors_at_once(
+            self, monkeypatch, random_message, homework_module
+    ):
+        sleeps = []
+        monkeypatch.setattr(time, 'sleep', sleeps.append)
+        bot = check_utils.RecordingTelegramBot(
+            errors=[telegram_exception(400)]
+        )
+
+        with pytest.raises(telebot.apihelper.ApiTelegramException):
+            homework_module.send_message(bot, f'{random_message}_bad')
+
+        assert not sleeps, (
+            'Убедитесь, что ошибки Telegram, кроме 429, не повторяются.'
+        )
+
+    def test_main_backs_off_on_repeated_failures(
+            self, monkeypatch, random_timestamp, homework_module
+    ):
+        mock_get = create_mock_get_with_failures(5, random_timestamp)
+        bot = check_utils.RecordingTelegramBot()
+
+        sleeps = run_main(
+            monkeypatch, homework_module, mock_get, bot, iterations=5
+        )
+
+        assert sleeps == [600, 1200, 2400, 3600, 3600], (
+            'Убедитесь, что при повторных сбоях пауза удваивается, но не '
+            'превышает `MAX_RETRY_PERIOD`.'
+        )
+
+    def test_main_resets_backoff_after_success(
+            self, monkeypatch, random_timestamp, homework_module
+    ):
+        mock_get = create_mock_get_with_failures(2, random_timestamp)
+        bot = check_utils.RecordingTelegramBot()
+
+        sleeps = run_main(
+            monkeypatch, homework_module, mock_get, bot, iterations=4
+        )
+
+        assert sleeps == [600, 1200, 600, 600], (
+            'Убедитесь, что после успешного запроса пауза возвращается к '
+            '`RETRY_PERIOD`.'
+        )
+
+    def test_main_backoff_not_shorter_than_retry_period(
+            self, monkeypatch, random_timestamp, homework_module
+    ):
+        monkeypatch.setattr(homework_module, 'RETRY_PERIOD', 5000)
+        mock_get = create_mock_get_with_failures(3, random_timestamp)
+        bot = check_utils.RecordingTelegramBot()
+
+        sleeps = run_main(
+            monkeypatch, homework_module, mock_get, bot, iterations=3
+        )
+
+        assert sleeps == [5000, 5000, 5000], (
+            'Убедитесь, что пауза после сбоя не короче `RETRY_PERIOD`.'
+        )
+
+    def test_main_does_not_repeat_error_within_ttl(
+            self, monkeypatch, homework_module
+    ):
+        mock_get = create_mock_get_with_errors([
+            'Connection refused: <HTTPSConnection object at 0x7f01>',
+            'Connection refused: <HTTPSConnection object at 0x7f02>',
+            'Connection refused: <HTTPSConnection object at 0x7f03>',
+        ])
+        bot = check_utils.RecordingTelegramBot()
+
+        run_main(
+            monkeypatch, homework_module, mock_get, bot, iterations=3,
+            clock=[1000000]
+        )
+
+        assert len(bot.sent) == 1, (
+            'Убедитесь, что сообщение об одном и том же сбое не отправляется '
+            'повторно в течение `ERROR_MESSAGE_TTL`, даже если текст '
+            'исключения меняется.'
+        )
+
+    def test_main_repeats_error_after_ttl(
+            self, monkeypatch, random_message, homework_module
+    ):
+        monkeypatch.setattr(homework_module, 'RETRY_PERIOD', 4000)
+        mock_get = create_mock_get_with_errors([random_message] * 3)
+        bot = check_utils.RecordingTelegramBot()
+
+        run_main(
+            monkeypatch, homework_module, mock_get, bot, iterations=3,
+            clock=[1000000]
+        )
+
+        assert len(bot.sent) == 3, (
+            'Убедитесь, что сообщение об ошибке отправляется снова по '
+            'истечении `ERROR_MESSAGE_TTL`.'
+        )
+
+    @pytest.mark.parametrize('retry_period', [0, -5])
+    def test_main_rejects_invalid_retry_period(
+            self, monkeypatch, random_timestamp, homework_module, caplog,
+            retry_period
+    ):
+        monkeypatch.setattr(homework_module, 'RETRY_PERIOD', retry_period)
+        mock_get = create_mock_get_with_failures(0, random_timestamp)
+        bot = check_utils.RecordingTelegramBot()
+
+        with check_utils.check_logging(
+            caplog, level=logging.CRITICAL, message=(
+                'Убедитесь, что недопустимый `RETRY_PERIOD` логируется с '
+                'уровнем `CRITICAL`.'
+            )
+        ):
+            with pytest.raises(SystemExit):
+                run_main(
+                    monkeypatch, homework_module, mock_get, bot, iterations=1
+                )
+
+    def test_main_sends_unchanged_status_once(
+            self, monkeypatch, random_timestamp, homework_module,
+            data_with_new_hw_status
+    ):
+        mock_get = create_mock_response_get_with_custom_status_and_data(
+            random_timestamp=random_timestamp,
+            http_status=HTTPStatus.OK,
+            data=data_with_new_hw_status
+        )
+        bot = check_utils.RecordingTelegramBot()
+        parsed = []
+        parse_status = homework_module.parse_status
+
+        def spy_parse_status(homework):
+            parsed.append(homework)
+            return parse_status(homework)
+
+        monkeypatch.setattr(homework_module, 'parse_status', spy_parse_status)
+
+        run_main(monkeypatch, homework_module, mock_get, bot, iterations=2)
+
+        assert len(bot.sent) == 1, (
+            'Убедитесь, что о неизменившемся статусе не сообщается повторно.'
+        )
+        assert len(parsed) == 1, (
+            'Убедитесь, что неизменившийся статус не разбирается повторно.'
+        )
+
+    def test_main_batches_changed_homeworks(
+            self, monkeypatch, random_timestamp, random_message,
+            homework_module
+    ):
+        homeworks = [
+            {'homework_name': f'{random_message}_1', 'status': 'approved'},
+            {'homework_name': f'{random_message}_2', 'status': 'rejected'}
+        ]
+        mock_get = create_mock_response_get_with_custom_status_and_data(
+            random_timestamp=random_timestamp,
+            http_status=HTTPStatus.OK,
+            data={'homeworks': homeworks, 'current_date': random_timestamp}
+        )
+        bot = check_utils.RecordingTelegramBot()
+
+        run_main(monkeypatch, homework_module, mock_get, bot, iterations=1)
+
+        assert len(bot.sent) == 1, (
+            'Убедитесь, что изменения статусов нескольких домашних работ '
+            'отправляются одним сообщением.'
+        )
+        for homework in homeworks:
+            assert homework['homework_name'] in bot.sent[0], (
+                'Убедитесь, что в сообщение попадают все домашние работы с '
+                'изменившимся статусом.'
+            )
+            assert self.HOMEWORK_VERDICTS[homework['status']] in bot.sent[0], (
+                'Убедитесь, что в сообщение попадают вердикты всех '
+                'изменившихся домашних работ.'
+            )